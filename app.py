@@ -1,108 +1,445 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, Response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from flask_cors import CORS
 import pandas as pd
+import numpy as np
 import os
+import itertools
+import secrets
+import time
+import sqlite3
+import threading
 from datetime import datetime
+from functools import lru_cache
+from contextlib import closing, contextmanager
 import json
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:  # optional, speeds up skill matching at load time
+    ahocorasick = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional, Arrow copy of the catalog for row output
+    pa = None
+
+try:
+    from numba import njit
+except ImportError:  # optional, compiles the course scoring kernel
+    njit = None
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend integration
 
-# Data storage (in-memory for simplicity - use database in production)
-learner_profiles = {}
-skill_assessments = {}
-learning_paths = {}
-progress_data = {}
+# Data storage: SQLite database (path configurable via APP_DB_PATH)
+DB_PATH = os.environ.get('APP_DB_PATH', 'app.db')
+
+# Connections are cached per OS thread. Under gevent's monkey-patching
+# threading.local is greenlet-local, so use the unpatched class there: all
+# greenlets of a worker then share one connection (nothing inside
+# user_write_lock yields, so their transactions cannot interleave).
+try:
+    from gevent.monkey import get_original
+    _db_local = get_original('threading', 'local')()
+except ImportError:
+    _db_local = threading.local()
+
+def get_db():
+    """Per-OS-thread SQLite connection in autocommit mode"""
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False)
+        _db_local.conn = conn
+    return conn
+
+# Striped per-user locks: a user always maps to the same lock, and memory
+# stays bounded however many users register
+_user_locks = [threading.Lock() for _ in range(64)]
+
+@contextmanager
+def user_write_lock(user_id):
+    """
+    Serialize read-modify-write of a user's documents. The thread lock covers
+    this process; the IMMEDIATE transaction covers other server processes.
+    Readers need no lock: each SELECT returns its own consistent copy.
+    """
+    with _user_locks[hash(user_id) % len(_user_locks)]:
+        conn = get_db()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+class JSONStore:
+    """Dict-like table of JSON documents keyed by user_id"""
+
+    def __init__(self, table):
+        self.table = table
+        self._select = f'SELECT json FROM {table} WHERE user_id = ?'
+        self._upsert = f'INSERT OR REPLACE INTO {table} (user_id, json) VALUES (?, ?)'
+        self._delete = f'DELETE FROM {table} WHERE user_id = ?'
+        # Short-lived connection so none is inherited by forked server workers
+        with closing(sqlite3.connect(DB_PATH)) as conn:
+            # WAL mode is stored in the database file, so setting it once is enough
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} (user_id TEXT PRIMARY KEY, json TEXT NOT NULL)'
+            )
+            conn.commit()
+
+    def get(self, user_id, default=None):
+        row = get_db().execute(self._select, (user_id,)).fetchone()
+        return orjson.loads(row[0]) if row is not None else default
+
+    def __getitem__(self, user_id):
+        value = self.get(user_id)
+        if value is None:
+            raise KeyError(user_id)
+        return value
+
+    def __setitem__(self, user_id, value):
+        get_db().execute(self._upsert, (user_id, orjson.dumps(value).decode()))
+
+    def __delitem__(self, user_id):
+        get_db().execute(self._delete, (user_id,))
+
+    def __contains__(self, user_id):
+        return get_db().execute(self._select, (user_id,)).fetchone() is not None
+
+learner_profiles = JSONStore('profiles')
+skill_assessments = JSONStore('assessments')
+learning_paths = JSONStore('paths')
+progress_data = JSONStore('progress')
+
+# orjson options for API responses (numpy scalars from pandas, naive datetimes as UTC)
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+def json_response(obj, status=200):
+    """JSON response encoded with orjson (replaces flask.jsonify)"""
+    return Response(orjson.dumps(obj, option=JSON_OPTIONS), status=status,
+                    mimetype='application/json')
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used to parse request.json"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default,
+                            option=JSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = ORJSONProvider(app)
+
+# Course columns consumed by the recommendation engine
+COURSE_COLUMNS = ['title', 'provider', 'domain', 'level', 'duration', 'rating',
+                  'students', 'format', 'skills', 'description']
+
+# Skills required per canonical domain
+DOMAIN_REQUIREMENTS = {
+    'computer-science': ('Programming Fundamentals', 'Data Structures', 'Algorithms', 'Software Engineering'),
+    'data-science': ('Python', 'Statistics', 'Machine Learning', 'Data Analysis'),
+    'web-development': ('HTML', 'CSS', 'JavaScript', 'React', 'Node.js', 'Database Design'),
+    'mobile-development': ('Mobile App Design', 'iOS Development', 'Android Development', 'UI/UX', 'API Integration'),
+    'cybersecurity': ('Network Security', 'Ethical Hacking', 'Cryptography', 'Security Analysis'),
+    'ai-ml': ('Python', 'Machine Learning', 'Deep Learning', 'Neural Networks'),
+    'business': ('Business Strategy', 'Marketing', 'Finance', 'Management'),
+    'design': ('UI/UX Design', 'Graphic Design', 'Design Tools', 'User Research'),
+    'marketing': ('Digital Marketing', 'SEO', 'Content Marketing', 'Analytics')
+}
+
+# (name, lowercased name) pairs, computed once
+DOMAIN_REQUIRED_SKILLS = {
+    domain: tuple((skill, skill.lower()) for skill in skills)
+    for domain, skills in DOMAIN_REQUIREMENTS.items()
+}
+
+# Every required skill name, lowercased
+KNOWN_SKILLS = frozenset(
+    skill_lc for skills in DOMAIN_REQUIRED_SKILLS.values() for _, skill_lc in skills
+)
+
+# Column of each known skill in SKILL_MATRIX
+KNOWN_SKILL_IDS = {skill: i for i, skill in enumerate(sorted(KNOWN_SKILLS))}
+
+DEFAULT_DOMAIN = 'data-science'
+
+def read_dataset(name, columns=None):
+    """
+    Read data/<name>.parquet when it is present and up to date
+    (built by scripts/build_cache.py), otherwise fall back to the CSV
+    """
+    csv_file = f'data/{name}.csv'
+    parquet_file = f'data/{name}.parquet'
+
+    if os.path.exists(parquet_file) and (
+            not os.path.exists(csv_file) or
+            os.path.getmtime(parquet_file) >= os.path.getmtime(csv_file)):
+        try:
+            return pd.read_parquet(parquet_file, columns=columns, engine='pyarrow')
+        except Exception as e:
+            print(f"Error loading {name}.parquet, falling back to CSV: {e}")
+
+    if os.path.exists(csv_file):
+        usecols = (lambda column: column in columns) if columns else None
+        return pd.read_csv(csv_file, usecols=usecols)
+
+    return None
+
+def lowercase_column(series):
+    """Lowercase a column once at load time (missing values become '')"""
+    return [str(value).lower() if pd.notna(value) else '' for value in series]
 
-# Load CSV datasets
+def find_known_skills(texts, skills):
+    """
+    For each text, the frozenset of skills (lowercase) it contains. Uses a
+    single Aho-Corasick pass per text when pyahocorasick is installed.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for skill in skills:
+            automaton.add_word(skill, skill)
+        automaton.make_automaton()
+        return [frozenset(skill for _, skill in automaton.iter(text)) for text in texts]
+
+    return [frozenset(skill for skill in skills if skill in text) for text in texts]
+
+# Load datasets
 def load_datasets():
-    """Load students and courses CSV files"""
-    students_file = 'data/students.csv'
-    courses_file = 'data/courses.csv'
-    
+    """Load students and courses datasets"""
     students_df = None
     courses_df = None
     
     try:
-        if os.path.exists(students_file):
-            students_df = pd.read_csv(students_file)
+        students_df = read_dataset('students')
+        if students_df is not None:
             print(f"Loaded {len(students_df)} student records")
     except Exception as e:
-        print(f"Error loading students.csv: {e}")
+        print(f"Error loading students dataset: {e}")
     
     try:
-        if os.path.exists(courses_file):
-            courses_df = pd.read_csv(courses_file)
+        courses_df = read_dataset('courses', columns=COURSE_COLUMNS)
+        if courses_df is not None:
+            # Normalized copies used for matching in recommend_courses
+            for column in ('domain', 'skills', 'level', 'format'):
+                if column in courses_df.columns:
+                    courses_df[f'_{column}_lc'] = lowercase_column(courses_df[column])
+            # Required skills (from DOMAIN_REQUIREMENTS) mentioned by each course
+            if '_skills_lc' in courses_df.columns:
+                courses_df['_skill_matches'] = find_known_skills(courses_df['_skills_lc'], KNOWN_SKILLS)
             print(f"Loaded {len(courses_df)} course records")
     except Exception as e:
-        print(f"Error loading courses.csv: {e}")
+        print(f"Error loading courses dataset: {e}")
     
     return students_df, courses_df
 
+def build_domain_index(courses_df):
+    """
+    Group courses by normalized domain: {domain: DataFrame}. Courses without
+    a domain (lowercased to '') are left out, as they never match a domain.
+    """
+    if courses_df is None or '_domain_lc' not in courses_df.columns:
+        return {}
+    return {domain: group for domain, group in courses_df.groupby('_domain_lc', sort=False)
+            if domain}
+
+def course_column(df, column, default):
+    """Return a string column of df, or a column filled with default if absent"""
+    if column in df.columns:
+        return df[column]
+    return pd.Series(default, index=df.index, dtype=object)
+
+def encode_courses(courses_df):
+    """
+    Int-coded arrays for score_courses, aligned with the rows of courses_df
+    (which has a RangeIndex, so index labels are row positions):
+    SKILL_MATRIX[i, j] is True when course i mentions known skill j, and
+    level/format are coded against LEVEL_IDS/FORMAT_IDS.
+    """
+    if courses_df is None:
+        return np.zeros((0, len(KNOWN_SKILL_IDS)), dtype=np.bool_), {}, None, {}, None
+
+    skill_matrix = np.zeros((len(courses_df), len(KNOWN_SKILL_IDS)), dtype=np.bool_)
+    if '_skill_matches' in courses_df.columns:
+        for row, matches in enumerate(courses_df['_skill_matches']):
+            for skill in matches:
+                skill_matrix[row, KNOWN_SKILL_IDS[skill]] = True
+
+    level_codes, levels = pd.factorize(course_column(courses_df, '_level_lc', 'beginner'))
+    format_codes, formats = pd.factorize(course_column(courses_df, '_format_lc', 'video'))
+
+    return (skill_matrix,
+            {level: i for i, level in enumerate(levels)}, level_codes.astype(np.int32),
+            {fmt: i for i, fmt in enumerate(formats)}, format_codes.astype(np.int32))
+
+def build_course_table(courses_df):
+    """Arrow table of the course columns returned by the API"""
+    if pa is None or courses_df is None:
+        return None
+    columns = [column for column in COURSE_COLUMNS if column in courses_df.columns]
+    return pa.Table.from_pandas(courses_df[columns], preserve_index=False)
+
 # Initialize datasets
 students_df, courses_df = load_datasets()
+DOMAIN_INDEX = build_domain_index(courses_df)
+SKILL_MATRIX, LEVEL_IDS, LEVEL_CODES, FORMAT_IDS, FORMAT_CODES = encode_courses(courses_df)
+COURSE_TABLE = build_course_table(courses_df)
 
-def analyze_skill_gaps(assessment_skills, target_domain):
+@lru_cache(maxsize=256)
+def courses_for_domain(target_domain):
     """
-    Improved skill gap analysis with flexible domain matching
+    Courses whose domain contains target_domain. Exact domains are a single
+    dict probe; other inputs are matched against the distinct domain keys.
+    Falls back to all courses when nothing matches.
+    """
+    domain_courses = DOMAIN_INDEX.get(target_domain)
+    if domain_courses is not None:
+        return domain_courses
+
+    matches = [group for domain, group in DOMAIN_INDEX.items() if target_domain in domain]
+    if not matches:
+        return courses_df
+    if len(matches) == 1:
+        return matches[0]
+    # Keep catalog order when several domains match
+    return pd.concat(matches).sort_index()
+
+def normalize_domain(target_domain):
+    """Normalize a domain name: 'Web Development' -> 'web-development'"""
+    return target_domain.lower().strip().replace(" ", "-")
+
+@lru_cache(maxsize=256)
+def resolve_domain(normalized_domain):
     """
+    Map a normalized domain to a key of DOMAIN_REQUIREMENTS. Unknown input is
+    matched flexibly (substring either way) and falls back to data-science.
+    """
+    # Canonical names resolve with a single dict lookup
+    if normalized_domain in DOMAIN_REQUIREMENTS:
+        return normalized_domain
 
-    domain_requirements = {
-        'computer-science': ['Programming Fundamentals', 'Data Structures', 'Algorithms', 'Software Engineering'],
-        'data-science': ['Python', 'Statistics', 'Machine Learning', 'Data Analysis'],
-        'web-development': ['HTML', 'CSS', 'JavaScript', 'React', 'Node.js', 'Database Design'],
-        'mobile-development': ['Mobile App Design', 'iOS Development', 'Android Development', 'UI/UX', 'API Integration'],
-        'cybersecurity': ['Network Security', 'Ethical Hacking', 'Cryptography', 'Security Analysis'],
-        'ai-ml': ['Python', 'Machine Learning', 'Deep Learning', 'Neural Networks'],
-        'business': ['Business Strategy', 'Marketing', 'Finance', 'Management'],
-        'design': ['UI/UX Design', 'Graphic Design', 'Design Tools', 'User Research'],
-        'marketing': ['Digital Marketing', 'SEO', 'Content Marketing', 'Analytics']
-    }
+    for domain in DOMAIN_REQUIREMENTS:
+        if domain in normalized_domain or normalized_domain in domain:
+            return domain
 
-    # Normalize domain (VERY IMPORTANT FIX)
-    normalized_domain = target_domain.lower().strip().replace(" ", "-")
+    return DEFAULT_DOMAIN
 
-    required_skills = []
+def analyze_skill_gaps(assessment_skills, target_domain):
+    """
+    Improved skill gap analysis with flexible domain matching
+    """
 
-    # Flexible domain matching
-    for domain in domain_requirements:
-        if domain in normalized_domain or normalized_domain in domain:
-            required_skills = domain_requirements[domain]
-            break
+    required_skills = DOMAIN_REQUIRED_SKILLS[resolve_domain(normalize_domain(target_domain))]
 
-    # If no match found → fallback to data-science (safe default)
-    if not required_skills:
-        required_skills = domain_requirements['data-science']
+    # Lowercase each assessed name once; the first occurrence of a name wins
+    assessed_levels = {}
+    for assessed_skill in assessment_skills:
+        assessed_levels.setdefault(assessed_skill['name'].lower(), assessed_skill.get('level', 0))
 
     skill_gaps = []
 
-    for skill in required_skills:
-        found = False
+    for skill, skill_lc in required_skills:
+        # Assessed names may be longer than the required one ("Python basics")
+        level = next((lvl for name, lvl in assessed_levels.items() if skill_lc in name), None)
 
-        for assessed_skill in assessment_skills:
-            if skill.lower() in assessed_skill['name'].lower():
-                found = True
-
-                if assessed_skill['level'] <= 2:
-                    skill_gaps.append({
-                        'name': skill,
-                        'current_level': assessed_skill['level'],
-                        'recommended_level': 4,
-                        'priority': 'High'
-                    })
-                break
-
-        if not found:
+        if level is None:
             skill_gaps.append({
                 'name': skill,
                 'current_level': 0,
                 'recommended_level': 3,
                 'priority': 'High'
             })
+        elif level <= 2:
+            skill_gaps.append({
+                'name': skill,
+                'current_level': level,
+                'recommended_level': 4,
+                'priority': 'High'
+            })
 
     return skill_gaps
 
 
+def top_k_indices(scores, k):
+    """
+    Positions of the k highest scores, best first. Ties keep their original
+    order, matching a stable descending sort.
+    """
+    if len(scores) > k:
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.argsort(-scores[candidates], kind='stable')
+    return candidates[order][:k]
+
+
+def score_courses_numpy(rows, gap_ids, level_id, style_mask,
+                        skill_matrix, level_codes, format_codes):
+    """
+    Score the courses at positions rows: +3 per gap skill mentioned,
+    +2 for a matching level, +1 when the format matches the learning style
+    """
+    score = 3 * skill_matrix[np.ix_(rows, gap_ids)].sum(axis=1, dtype=np.int32)
+    score += 2 * (level_codes[rows] == level_id)
+    score += style_mask[format_codes[rows]]
+    return score.astype(np.int32)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def score_courses(rows, gap_ids, level_id, style_mask,
+                      skill_matrix, level_codes, format_codes):
+        """Compiled equivalent of score_courses_numpy"""
+        score = np.zeros(len(rows), dtype=np.int32)
+        for i in range(len(rows)):
+            row = rows[i]
+            total = 0
+            for gap_id in gap_ids:
+                if skill_matrix[row, gap_id]:
+                    total += 3
+            if level_codes[row] == level_id:
+                total += 2
+            if style_mask[format_codes[row]]:
+                total += 1
+            score[i] = total
+        return score
+else:
+    score_courses = score_courses_numpy
+
+# Compile the kernel at startup (with the dtypes recommend_courses passes)
+# rather than on the first /generate-path, which would stall the worker
+if njit is not None and LEVEL_CODES is not None:
+    score_courses(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), -1,
+                  np.zeros(len(FORMAT_IDS), dtype=np.bool_),
+                  SKILL_MATRIX, LEVEL_CODES, FORMAT_CODES)
+
+
+def course_records(rows):
+    """Course rows at positions rows as plain dicts"""
+    if COURSE_TABLE is not None:
+        return COURSE_TABLE.take(rows).to_pylist()
+    return courses_df.iloc[rows].to_dict('records')
+
+
+# Returned by recommend_courses when the catalog is missing or nothing matches
+FALLBACK_RECOMMENDATIONS = ({
+    'title': 'Python for Data Science',
+    'provider': 'Udemy',
+    'level': 'Beginner',
+    'duration': '30 hours',
+    'rating': 4.6,
+    'students': '100,000+',
+    'description': 'Complete Python guide for Data Science',
+    'score': 5
+},)
+
+
 def recommend_courses(learner_profile, assessment_skills, skill_gaps):
     """
     Improved course recommendation logic
@@ -114,71 +451,150 @@ def recommend_courses(learner_profile, assessment_skills, skill_gaps):
 
         target_domain = learner_profile.get('currentDomain', '').lower()
 
-        # Flexible filtering
-        if 'domain' in courses_df.columns:
-            domain_courses = courses_df[
-                courses_df['domain'].str.lower().str.contains(target_domain, na=False)
-            ]
-        else:
-            domain_courses = courses_df
-
-        # If no match → use all courses
-        if domain_courses.empty:
-            domain_courses = courses_df
-
-        for _, course in domain_courses.iterrows():
-            score = 0
-
-            course_skills = str(course.get('skills', '')).lower()
-
-            # Skill gap match
-            for gap in skill_gaps:
-                if gap['name'].lower() in course_skills:
-                    score += 3
-
-            # Experience level match
-            experience = learner_profile.get('experienceLevel', 'beginner').lower()
-            course_level = str(course.get('level', 'beginner')).lower()
-
-            if experience == course_level:
-                score += 2
-
-            # Learning style match
-            learning_style = learner_profile.get('learningStyle', 'video').lower()
-            course_format = str(course.get('format', 'video')).lower()
-
-            if learning_style in course_format:
-                score += 1
-
-            # Always allow minimal score
-            if score >= 1:
-                recommendations.append({
-                    'title': course.get('title', 'Unknown Course'),
-                    'provider': course.get('provider', 'Unknown'),
-                    'level': course.get('level', 'Beginner'),
-                    'duration': course.get('duration', 'N/A'),
-                    'rating': float(course.get('rating', 0)) if pd.notna(course.get('rating')) else 0,
-                    'students': course.get('students', 'N/A'),
-                    'description': course.get('description', ''),
-                    'score': score
-                })
-
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
+        # Flexible filtering (falls back to all courses if no match)
+        domain_courses = courses_for_domain(target_domain)
+
+        gap_names = [gap['name'].lower() for gap in skill_gaps]
+        experience = learner_profile.get('experienceLevel', 'beginner').lower()
+        learning_style = learner_profile.get('learningStyle', 'video').lower()
+
+        # Gaps come from analyze_skill_gaps, so every name is a column of SKILL_MATRIX
+        assert KNOWN_SKILLS.issuperset(gap_names), 'skill gaps must come from DOMAIN_REQUIREMENTS'
+
+        # Skill gap, experience level and learning style matches on the
+        # int-coded arrays built at load time
+        gap_ids = np.array(sorted({KNOWN_SKILL_IDS[name] for name in gap_names}), dtype=np.int64)
+        style_mask = np.array([learning_style in fmt for fmt in FORMAT_IDS], dtype=np.bool_)
+        rows = np.array(domain_courses.index, dtype=np.int64)  # writable, as compiled at startup
+        score = score_courses(rows, gap_ids, LEVEL_IDS.get(experience, -1), style_mask,
+                              SKILL_MATRIX, LEVEL_CODES, FORMAT_CODES)
+
+        # Always allow minimal score; only the top rows are materialized
+        top = [position for position in top_k_indices(score, 10) if score[position] >= 1]
+
+        for position, course in zip(top, course_records(rows[top])):
+            recommendations.append({
+                'title': course.get('title', 'Unknown Course'),
+                'provider': course.get('provider', 'Unknown'),
+                'level': course.get('level', 'Beginner'),
+                'duration': course.get('duration', 'N/A'),
+                'rating': float(course.get('rating', 0)) if pd.notna(course.get('rating')) else 0,
+                'students': course.get('students', 'N/A'),
+                'description': course.get('description', ''),
+                'score': int(score[position])
+            })
 
         if recommendations:
-            return recommendations[:10]
+            return recommendations
+
+    # Guaranteed fallback if CSV fails (copies, so the constant stays intact)
+    return [dict(course) for course in FALLBACK_RECOMMENDATIONS]
+
+
+# Profile fields that affect the generated learning path
+PATH_PROFILE_FIELDS = ('currentDomain', 'experienceLevel', 'learningStyle')
+
+@lru_cache(maxsize=1024)
+def compute_learning_path(profile_key, skills_key):
+    """
+    Skill gaps, recommended skills and recommended courses for a profile.
+    profile_key is a tuple of (field, value) pairs from PATH_PROFILE_FIELDS and
+    skills_key a tuple of (name, level) pairs in assessment order. Results are
+    cached and shared between users, so they are returned as tuples.
+    """
+    profile = dict(profile_key)
+    assessment_skills = [{'name': name, 'level': level} for name, level in skills_key]
+
+    # Perform skill gap analysis
+    skill_gaps = analyze_skill_gaps(
+        assessment_skills,
+        profile.get('currentDomain', '')
+    )
+
+    # Get recommended skills (from skill gaps)
+    recommended_skills = [
+        {
+            'name': gap['name'],
+            'description': f"Develop {gap['name']} skills to reach level {gap['recommended_level']}",
+            'level': 'Beginner' if gap['current_level'] == 0 else
+                    'Intermediate' if gap['current_level'] <= 2 else 'Advanced',
+            'priority': gap['priority']
+        }
+        for gap in skill_gaps
+    ]
+
+    # Get course recommendations
+    recommended_courses = recommend_courses(profile, assessment_skills, skill_gaps)
+
+    return tuple(skill_gaps), tuple(recommended_skills), tuple(recommended_courses)
+
 
-    # Guaranteed fallback if CSV fails
-    return [{
-        'title': 'Python for Data Science',
-        'provider': 'Udemy',
-        'level': 'Beginner',
-        'duration': '30 hours',
-        'rating': 4.6,
-        'students': '100,000+',
-        'description': 'Complete Python guide for Data Science',
-        'score': 5
-    }]
+# Skill level weights for the dashboard's average skill level
+SKILL_LEVEL_VALUES = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3}
+
+# Progress document for users without a learning path yet
+EMPTY_PROGRESS = {
+    'skills': {},
+    'courses': {},
+    'stats': {'completed': 0, 'in_progress': 0, 'total_progress': 0,
+              'mastered_skills': 0, 'total_level': 0},
+    'version': 0
+}
+
+# Browsers may reuse a dashboard for this many seconds before revalidating
+# with If-None-Match; 0 means always revalidate (cheap 304 when unchanged)
+DASHBOARD_MAX_AGE = 0
+
+def dashboard_cache_headers(response, etag):
+    """Attach the weak ETag and private Cache-Control to a dashboard response"""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = f'private, max-age={DASHBOARD_MAX_AGE}'
+    return response
+
+# Records encoded per chunk when streaming the dashboard
+STREAM_BATCH_SIZE = 64
+
+def stream_json_array(records, prefix, suffix):
+    """
+    Yield prefix + JSON array of records + suffix in chunks of
+    STREAM_BATCH_SIZE records. The prefix and suffix travel with the first
+    and last chunk, so a short array is a single chunk.
+    """
+    records = iter(records)
+    chunk = prefix + b'['
+    batch = list(itertools.islice(records, STREAM_BATCH_SIZE))
+    while batch:
+        chunk += b','.join(orjson.dumps(record, option=JSON_OPTIONS) for record in batch)
+        batch = list(itertools.islice(records, STREAM_BATCH_SIZE))
+        if batch:
+            yield chunk
+            chunk = b','
+    yield chunk + b']' + suffix
+
+def stream_dashboard(user_id, statistics, skills, courses, summary):
+    """Yield the /dashboard JSON body: one chunk per array unless they are long"""
+    head = (b'{"success":true,"dashboard":{"userId":' + orjson.dumps(user_id) +
+            b',"statistics":' + orjson.dumps(statistics, option=JSON_OPTIONS) +
+            b',"skills":')
+    tail = b',"summary":' + orjson.dumps(summary, option=JSON_OPTIONS) + b'}}'
+    yield from stream_json_array(skills, head, b'')
+    yield from stream_json_array(courses, b',"courses":', tail)
+
+def progress_as_lists(progress):
+    """Progress with skill and course records as lists, as returned by the API"""
+    return {
+        'skills': list(progress['skills'].values()),
+        'courses': list(progress['courses'].values())
+    }
+
+
+# Per-process tag and counter keep concurrent registrations from colliding
+_USER_ID_TAG = secrets.token_hex(2)
+_user_id_counter = itertools.count()
+
+def new_user_id():
+    """Unique, time-ordered user ID: user_<ns timestamp><process tag><counter>"""
+    return f"user_{time.time_ns():x}{_USER_ID_TAG}{next(_user_id_counter) & 0xffff:04x}"
 
 
 # API Endpoints
@@ -186,7 +602,7 @@ def recommend_courses(learner_profile, assessment_skills, skill_gaps):
 @app.route('/')
 def home():
     """Home endpoint"""
-    return jsonify({
+    return json_response({
         'message': 'AI-Powered Personalized Learning Path Generator API',
         'version': '1.0.0',
         'endpoints': {
@@ -209,27 +625,28 @@ def register_learner():
         
         for field in required_fields:
             if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+                return json_response({'error': f'Missing required field: {field}'}, 400)
         
         # Generate user ID
-        user_id = f"user_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        user_id = new_user_id()
         
         # Store learner profile
-        learner_profiles[user_id] = {
+        profile = {
             'userId': user_id,
             **data,
             'registeredAt': datetime.now().isoformat()
         }
+        learner_profiles[user_id] = profile
         
-        return jsonify({
+        return json_response({
             'success': True,
             'message': 'Learner profile registered successfully',
             'userId': user_id,
-            'profile': learner_profiles[user_id]
-        }), 201
+            'profile': profile
+        }, 201)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/assessment', methods=['POST'])
 def submit_assessment():
@@ -239,16 +656,16 @@ def submit_assessment():
         
         # Validate required fields
         if 'userId' not in data:
-            return jsonify({'error': 'Missing userId'}), 400
+            return json_response({'error': 'Missing userId'}, 400)
         
         if 'skills' not in data or not isinstance(data['skills'], list):
-            return jsonify({'error': 'Missing or invalid skills array'}), 400
+            return json_response({'error': 'Missing or invalid skills array'}, 400)
         
         user_id = data['userId']
         
         # Validate user exists
         if user_id not in learner_profiles:
-            return jsonify({'error': 'User not found. Please register first.'}), 404
+            return json_response({'error': 'User not found. Please register first.'}, 404)
         
         # Calculate assessment metrics
         skills = data['skills']
@@ -257,7 +674,7 @@ def submit_assessment():
         average_level = total_score / total_skills if total_skills > 0 else 0
         
         # Store assessment
-        skill_assessments[user_id] = {
+        assessment = {
             'userId': user_id,
             'skills': skills,
             'totalSkills': total_skills,
@@ -265,15 +682,16 @@ def submit_assessment():
             'averageLevel': round(average_level, 2),
             'assessedAt': datetime.now().isoformat()
         }
+        skill_assessments[user_id] = assessment
         
-        return jsonify({
+        return json_response({
             'success': True,
             'message': 'Skill assessment submitted successfully',
-            'assessment': skill_assessments[user_id]
-        }), 200
+            'assessment': assessment
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/generate-path', methods=['POST'])
 def generate_learning_path():
@@ -283,79 +701,72 @@ def generate_learning_path():
         
         # Validate required fields
         if 'userId' not in data:
-            return jsonify({'error': 'Missing userId'}), 400
+            return json_response({'error': 'Missing userId'}, 400)
         
         user_id = data['userId']
         
-        # Validate user exists
-        if user_id not in learner_profiles:
-            return jsonify({'error': 'User not found. Please register first.'}), 404
+        # Get learner profile and assessment
+        profile = learner_profiles.get(user_id)
+        if profile is None:
+            return json_response({'error': 'User not found. Please register first.'}, 404)
         
-        # Validate assessment exists
-        if user_id not in skill_assessments:
-            return jsonify({'error': 'Assessment not found. Please submit assessment first.'}), 404
+        assessment = skill_assessments.get(user_id)
+        if assessment is None:
+            return json_response({'error': 'Assessment not found. Please submit assessment first.'}, 404)
         
-        # Get learner profile and assessment
-        profile = learner_profiles[user_id]
-        assessment = skill_assessments[user_id]
-        
-        # Perform skill gap analysis
-        skill_gaps = analyze_skill_gaps(
-            assessment['skills'],
-            profile.get('currentDomain', '')
-        )
-        
-        # Get recommended skills (from skill gaps)
-        recommended_skills = [
-            {
-                'name': gap['name'],
-                'description': f"Develop {gap['name']} skills to reach level {gap['recommended_level']}",
-                'level': 'Beginner' if gap['current_level'] == 0 else 
-                        'Intermediate' if gap['current_level'] <= 2 else 'Advanced',
-                'priority': gap['priority']
-            }
-            for gap in skill_gaps
-        ]
-        
-        # Get course recommendations
-        recommended_courses = recommend_courses(profile, assessment['skills'], skill_gaps)
+        # Skill gaps, skills and courses depend only on these inputs (cached)
+        profile_key = tuple((field, profile[field]) for field in PATH_PROFILE_FIELDS
+                            if field in profile)
+        skills_key = tuple((skill['name'], skill.get('level', 0)) for skill in assessment['skills'])
+        skill_gaps, recommended_skills, recommended_courses = compute_learning_path(
+            profile_key, skills_key)
         
         # Generate learning path
         learning_path = {
             'userId': user_id,
             'generatedAt': datetime.now().isoformat(),
-            'skills': recommended_skills,
-            'courses': recommended_courses,
+            'skills': list(recommended_skills),
+            'courses': list(recommended_courses),
             'totalSkills': len(recommended_skills),
             'totalCourses': len(recommended_courses),
-            'skillGaps': skill_gaps
+            'skillGaps': list(skill_gaps)
         }
         
         # Store learning path
         learning_paths[user_id] = learning_path
         
-        # Initialize progress data
-        if user_id not in progress_data:
-            progress_data[user_id] = {
-                'skills': [
-                    {'name': skill['name'], 'progress': 0, 'level': skill['level']}
-                    for skill in recommended_skills
-                ],
-                'courses': [
-                    {'title': course['title'], 'provider': course['provider'], 
-                     'progress': 0, 'status': 'not-started'}
-                    for course in recommended_courses
-                ]
-            }
-        
-        return jsonify({
+        # Initialize progress data (records keyed by skill name / course title)
+        with user_write_lock(user_id):
+            if user_id not in progress_data:
+                progress_data[user_id] = {
+                    'skills': {
+                        skill['name']: {'name': skill['name'], 'progress': 0, 'level': skill['level']}
+                        for skill in recommended_skills
+                    },
+                    'courses': {
+                        course['title']: {'title': course['title'], 'provider': course['provider'],
+                                          'progress': 0, 'status': 'not-started'}
+                        for course in recommended_courses
+                    },
+                    'stats': {
+                        'completed': 0,
+                        'in_progress': 0,
+                        'total_progress': 0,
+                        'mastered_skills': 0,
+                        'total_level': sum(SKILL_LEVEL_VALUES.get(skill['level'], 1)
+                                           for skill in recommended_skills)
+                    },
+                    'version': 1
+                }
+        
+        return json_response({
             'success': True,
             'message': 'Learning path generated successfully',
             'learningPath': learning_path
-        }), 200
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/dashboard/<user_id>', methods=['GET'])
 def get_dashboard_data(user_id):
@@ -363,66 +774,57 @@ def get_dashboard_data(user_id):
     try:
         # Check if user exists
         if user_id not in learner_profiles:
-            return jsonify({'error': 'User not found'}), 404
+            return json_response({'error': 'User not found'}, 404)
+        
+        # Get progress data; statistics are maintained by update_progress
+        user_progress = progress_data.get(user_id, EMPTY_PROGRESS)
         
-        # Get progress data
-        user_progress = progress_data.get(user_id, {
-            'skills': [],
-            'courses': []
-        })
+        # The version changes on every progress write, so the client's cached
+        # copy is still valid if it carries the current ETag
+        etag = f"{user_id}-{user_progress['version']}"
+        if request.if_none_match.contains_weak(etag):
+            return dashboard_cache_headers(Response(status=304), etag)
         
-        # Calculate statistics
-        total_courses = len(user_progress['courses'])
-        completed_courses = len([c for c in user_progress['courses'] if c.get('progress', 0) == 100])
-        in_progress_courses = len([c for c in user_progress['courses'] 
-                                  if 0 < c.get('progress', 0) < 100])
+        stats = user_progress['stats']
+        skills = user_progress['skills'].values()
+        courses = user_progress['courses'].values()
+        
+        total_courses = len(courses)
+        total_skills = len(skills)
         
         overall_progress = 0
         if total_courses > 0:
-            total_progress = sum(c.get('progress', 0) for c in user_progress['courses'])
-            overall_progress = round(total_progress / total_courses, 1)
-        
-        # Calculate skill statistics
-        total_skills = len(user_progress['skills'])
-        mastered_skills = len([s for s in user_progress['skills'] if s.get('progress', 0) >= 80])
+            overall_progress = round(stats['total_progress'] / total_courses, 1)
         
-        # Calculate average skill level
         avg_level = 0
         if total_skills > 0:
-            level_values = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3}
-            total_level = sum(level_values.get(s.get('level', 'Beginner'), 1) 
-                            for s in user_progress['skills'])
-            avg_level = round(total_level / total_skills, 1)
+            avg_level = round(stats['total_level'] / total_skills, 1)
         
-        # Calculate hours completed (assuming 40 hours per course on average)
-        hours_completed = round(sum(c.get('progress', 0) / 100 * 40 for c in user_progress['courses']), 1)
+        # Hours completed (assuming 40 hours per course on average)
+        hours_completed = round(stats['total_progress'] / 100 * 40, 1)
         
-        dashboard_data = {
-            'userId': user_id,
-            'statistics': {
-                'totalCourses': total_courses,
-                'completedCourses': completed_courses,
-                'inProgressCourses': in_progress_courses,
-                'overallProgress': overall_progress
-            },
-            'skills': user_progress['skills'],
-            'courses': user_progress['courses'],
-            'summary': {
-                'totalSkills': total_skills,
-                'masteredSkills': mastered_skills,
-                'averageSkillLevel': avg_level,
-                'hoursCompleted': hours_completed,
-                'completionRate': overall_progress
-            }
+        statistics = {
+            'totalCourses': total_courses,
+            'completedCourses': stats['completed'],
+            'inProgressCourses': stats['in_progress'],
+            'overallProgress': overall_progress
+        }
+        summary = {
+            'totalSkills': total_skills,
+            'masteredSkills': stats['mastered_skills'],
+            'averageSkillLevel': avg_level,
+            'hoursCompleted': hours_completed,
+            'completionRate': overall_progress
         }
         
-        return jsonify({
-            'success': True,
-            'dashboard': dashboard_data
-        }), 200
+        # Streamed with chunked encoding; skill and course records are
+        # encoded in batches rather than as one large body
+        response = Response(stream_dashboard(user_id, statistics, skills, courses, summary),
+                            status=200, mimetype='application/json')
+        return dashboard_cache_headers(response, etag)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/update-progress', methods=['POST'])
 def update_progress():
@@ -431,41 +833,52 @@ def update_progress():
         data = request.json
         
         if 'userId' not in data:
-            return jsonify({'error': 'Missing userId'}), 400
+            return json_response({'error': 'Missing userId'}, 400)
         
         user_id = data['userId']
         
-        if user_id not in progress_data:
-            return jsonify({'error': 'User progress not found'}), 404
-        
-        # Update skill progress
-        if 'skillProgress' in data:
-            for skill_update in data['skillProgress']:
-                for skill in progress_data[user_id]['skills']:
-                    if skill['name'] == skill_update['name']:
+        # Read-modify-write of the progress document under the user's lock
+        with user_write_lock(user_id):
+            user_progress = progress_data.get(user_id)
+            if user_progress is None:
+                return json_response({'error': 'User progress not found'}, 404)
+            stats = user_progress['stats']
+        
+            # Update skill progress
+            if 'skillProgress' in data:
+                for skill_update in data['skillProgress']:
+                    skill = user_progress['skills'].get(skill_update['name'])
+                    if skill is not None:
+                        stats['mastered_skills'] += (
+                            (skill_update['progress'] >= 80) - (skill.get('progress', 0) >= 80))
                         skill['progress'] = skill_update['progress']
-                        break
-        
-        # Update course progress
-        if 'courseProgress' in data:
-            for course_update in data['courseProgress']:
-                for course in progress_data[user_id]['courses']:
-                    if course['title'] == course_update['title']:
-                        course['progress'] = course_update['progress']
+        
+            # Update course progress
+            if 'courseProgress' in data:
+                for course_update in data['courseProgress']:
+                    course = user_progress['courses'].get(course_update['title'])
+                    if course is not None:
+                        old, new = course.get('progress', 0), course_update['progress']
+                        stats['completed'] += (new == 100) - (old == 100)
+                        stats['in_progress'] += (0 < new < 100) - (0 < old < 100)
+                        stats['total_progress'] += new - old
+                        course['progress'] = new
                         if course_update['progress'] == 100:
                             course['status'] = 'completed'
                         elif course_update['progress'] > 0:
                             course['status'] = 'in-progress'
-                        break
         
-        return jsonify({
+            user_progress['version'] += 1
+            progress_data[user_id] = user_progress
+        
+        return json_response({
             'success': True,
             'message': 'Progress updated successfully',
-            'progress': progress_data[user_id]
-        }), 200
+            'progress': progress_as_lists(user_progress)
+        }, 200)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 if __name__ == '__main__':
     # Create data directory if it doesn't exist
@@ -479,5 +892,6 @@ if __name__ == '__main__':
     print("  GET /dashboard/<user_id> - Get dashboard data")
     print("  POST /update-progress - Update progress")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; use gunicorn in production (see gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=5000)
 
@@ -0,0 +1,13 @@
+"""Gunicorn settings: gunicorn -c gunicorn.conf.py wsgi:app"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2))
+worker_class = 'gevent'
+worker_connections = 1000
+
+# Each worker loads the course datasets itself and opens its own SQLite
+# connections, so the app is not preloaded in the master process.
+preload_app = False
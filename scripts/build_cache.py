@@ -0,0 +1,41 @@
+"""
+One-shot build step: convert the CSV datasets in data/ to Parquet.
+Run from the project root after editing the CSV files:
+
+    python scripts/build_cache.py
+"""
+
+import os
+
+import pandas as pd
+
+DATA_DIR = 'data'
+
+# Low-cardinality string columns stored as pandas categoricals
+CATEGORY_COLUMNS = {
+    'courses': ['domain', 'level', 'format'],
+    'students': ['domain', 'education_level', 'experience_level'],
+}
+
+
+def build_cache(name):
+    """Convert data/<name>.csv to data/<name>.parquet"""
+    csv_file = os.path.join(DATA_DIR, f'{name}.csv')
+    parquet_file = os.path.join(DATA_DIR, f'{name}.parquet')
+
+    if not os.path.exists(csv_file):
+        print(f"Skipping {csv_file}: file not found")
+        return
+
+    df = pd.read_csv(csv_file)
+    for column in CATEGORY_COLUMNS.get(name, []):
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    df.to_parquet(parquet_file, compression='zstd', engine='pyarrow', index=False)
+    print(f"Wrote {len(df)} records to {parquet_file}")
+
+
+if __name__ == '__main__':
+    for dataset in ('students', 'courses'):
+        build_cache(dataset)
@@ -5,6 +5,8 @@ Run this after starting the Flask server to test all endpoints
 
 import requests
 import json
+import random
+import threading
 
 BASE_URL = "http://localhost:5000"
 
@@ -94,6 +96,110 @@ def test_update_progress(user_id):
     print(f"Response: {json.dumps(result, indent=2)}")
     return result.get('success', False)
 
+def statistics_match(dashboard):
+    """Check the dashboard's statistics against a full recount of its skills and courses"""
+    courses = dashboard['courses']
+    skills = dashboard['skills']
+    overall = round(sum(c['progress'] for c in courses) / len(courses), 1) if courses else 0
+    expected = {
+        'totalCourses': len(courses),
+        'completedCourses': len([c for c in courses if c['progress'] == 100]),
+        'inProgressCourses': len([c for c in courses if 0 < c['progress'] < 100]),
+        'overallProgress': overall
+    }
+    return (dashboard['statistics'] == expected and
+            dashboard['summary']['masteredSkills'] == len([s for s in skills if s['progress'] >= 80]) and
+            dashboard['summary']['hoursCompleted'] == round(sum(c['progress'] / 100 * 40 for c in courses), 1))
+
+def test_progress_statistics(user_id, updates=200):
+    """Test that incrementally maintained statistics match a recount after random updates"""
+    print(f"\n7. Testing dashboard statistics over {updates} random progress updates...")
+    dashboard = requests.get(f"{BASE_URL}/dashboard/{user_id}").json()['dashboard']
+    titles = [c['title'] for c in dashboard['courses']]
+    names = [s['name'] for s in dashboard['skills']]
+    
+    rng = random.Random(1)
+    for i in range(updates):
+        data = {
+            "userId": user_id,
+            "courseProgress": [
+                {"title": rng.choice(titles), "progress": rng.choice([0, 10, 50, 99, 100])}
+                for _ in range(3)
+            ],
+            "skillProgress": [
+                {"name": rng.choice(names), "progress": rng.choice([0, 79, 80, 100])}
+            ]
+        }
+        requests.post(f"{BASE_URL}/update-progress", json=data)
+        dashboard = requests.get(f"{BASE_URL}/dashboard/{user_id}").json()['dashboard']
+        if not statistics_match(dashboard):
+            print(f"Statistics diverged after update {i + 1}: {json.dumps(dashboard, indent=2)}")
+            return False
+    
+    print("Statistics match a full recount")
+    return True
+
+def etag_version(etag):
+    """Progress version from a dashboard ETag: W/"<user_id>-<version>" -> version"""
+    return int(etag.strip('W/"').rsplit('-', 1)[1])
+
+def test_dashboard_etag(user_id):
+    """Test dashboard revalidation: 304 while unchanged, new ETag after an update"""
+    print("\n8. Testing /dashboard/<user_id> ETag revalidation...")
+    response = requests.get(f"{BASE_URL}/dashboard/{user_id}")
+    etag = response.headers.get('ETag')
+    print(f"ETag: {etag}, Cache-Control: {response.headers.get('Cache-Control')}")
+    if not etag:
+        return False
+    
+    response = requests.get(f"{BASE_URL}/dashboard/{user_id}", headers={'If-None-Match': etag})
+    print(f"Unchanged: {response.status_code}")
+    if response.status_code != 304 or response.content:
+        return False
+    
+    course = requests.get(f"{BASE_URL}/dashboard/{user_id}").json()['dashboard']['courses'][0]
+    requests.post(f"{BASE_URL}/update-progress", json={
+        "userId": user_id,
+        "courseProgress": [{"title": course['title'], "progress": 42}]
+    })
+    
+    response = requests.get(f"{BASE_URL}/dashboard/{user_id}", headers={'If-None-Match': etag})
+    print(f"After update: {response.status_code}, ETag: {response.headers.get('ETag')}")
+    return (response.status_code == 200 and response.headers.get('ETag') != etag and
+            etag_version(response.headers['ETag']) == etag_version(etag) + 1)
+
+def test_concurrent_updates(user_id, threads=10, updates=50):
+    """Test that concurrent progress updates for one user are not lost"""
+    print(f"\n9. Testing {threads} threads x {updates} concurrent progress updates...")
+    response = requests.get(f"{BASE_URL}/dashboard/{user_id}")
+    start_version = etag_version(response.headers['ETag'])
+    titles = [c['title'] for c in response.json()['dashboard']['courses']]
+    failures = []
+    
+    def worker(seed):
+        rng = random.Random(seed)
+        with requests.Session() as session:
+            for _ in range(updates):
+                response = session.post(f"{BASE_URL}/update-progress", json={
+                    "userId": user_id,
+                    "courseProgress": [{"title": rng.choice(titles), "progress": rng.randint(0, 100)}]
+                })
+                if response.status_code != 200:
+                    failures.append(response.status_code)
+    
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    
+    # Every write bumps the progress version, so a lost update shows up as a gap
+    response = requests.get(f"{BASE_URL}/dashboard/{user_id}")
+    applied = etag_version(response.headers['ETag']) - start_version
+    print(f"Failed requests: {len(failures)}, updates applied: {applied}/{threads * updates}")
+    return (not failures and applied == threads * updates and
+            statistics_match(response.json()['dashboard']))
+
 def main():
     """Run all tests"""
     print("=" * 50)
@@ -134,6 +240,18 @@ def main():
         print("\n6. Testing /dashboard/<user_id> after progress update...")
         test_dashboard(user_id)
         
+        # Test incremental dashboard statistics
+        if not test_progress_statistics(user_id):
+            print("\n⚠️ Progress statistics test failed, but continuing...")
+        
+        # Test dashboard ETag / 304 round-trip
+        if not test_dashboard_etag(user_id):
+            print("\n⚠️ Dashboard ETag test failed, but continuing...")
+        
+        # Test concurrent progress updates
+        if not test_concurrent_updates(user_id):
+            print("\n⚠️ Concurrent update test failed, but continuing...")
+        
         print("\n" + "=" * 50)
         print("✅ All tests completed!")
         print("=" * 50)